@@ -1,13 +1,26 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:
+    MinMaxLTTBDownsampler = None
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
 
 # Set page configuration
 st.set_page_config(page_title="FIFA World Cup Dashboard", page_icon="⚽", layout="wide")
 
-# Custom CSS for better styling
+# Custom CSS for better styling. Emitted on every run on purpose: Streamlit
+# drops elements a rerun does not re-emit, so a once-per-session guard would
+# remove the styles after the first interaction.
 st.markdown("""
 <style>
     .main-header {
@@ -16,36 +29,139 @@ st.markdown("""
         text-align: center;
         margin-bottom: 2rem;
     }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        text-align: center;
-    }
-    .metric-value {
-        font-size: 2rem;
-        font-weight: bold;
-        color: #1f77b4;
-    }
-    .metric-label {
-        font-size: 1rem;
-        color: #666;
-    }
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
+def read_csv(path, **kwargs):
+    """Read a CSV with the pyarrow parser, falling back to the C parser if it fails"""
+    if CSV_ENGINE == 'pyarrow':
+        try:
+            return pd.read_csv(path, engine='pyarrow', **kwargs)
+        except Exception:
+            pass
+    return pd.read_csv(path, engine='c', **kwargs)
+
+@st.cache_resource
 def load_data():
-    """Load all FIFA World Cup datasets"""
+    """Load all FIFA World Cup datasets (shared read-only across reruns)"""
     try:
-        world_cups = pd.read_csv('WorldCups.csv')
-        matches = pd.read_csv('WorldCupMatches.csv')
-        players = pd.read_csv('WorldCupPlayers.csv')
+        # Low-cardinality labels are read as categoricals so counts and groupbys use integer codes
+        world_cups = read_csv('WorldCups.csv',
+                              usecols=['Year', 'Country', 'Winner', 'Runners-Up', 'GoalsScored',
+                                       'QualifiedTeams', 'MatchesPlayed', 'Attendance'],
+                              dtype={'Year': 'int16', 'Country': 'category',
+                                     'Winner': 'category', 'Runners-Up': 'category',
+                                     'Attendance': str})
+        matches = read_csv('WorldCupMatches.csv',
+                           usecols=['Year', 'Stage', 'Home Team Name', 'Home Team Goals',
+                                    'Away Team Name', 'Away Team Goals'],
+                           # Blank trailer rows leave NA in the numeric columns, so they stay float
+                           dtype={'Year': 'float64', 'Home Team Goals': 'float32',
+                                  'Away Team Goals': 'float32', 'Stage': 'category'})
+        players = read_csv('WorldCupPlayers.csv',
+                           usecols=['Player Name', 'Position', 'Team Initials', 'Coach Name'],
+                           dtype={'Position': 'category', 'Team Initials': 'category',
+                                  'Coach Name': 'category'})
+
+        # Parse attendance and shrink numeric columns once, at load time
+        world_cups['Attendance'] = pd.to_numeric(world_cups['Attendance'].str.replace('.', '', regex=False),
+                                                 downcast='float')
+        for col in ['GoalsScored', 'MatchesPlayed', 'QualifiedTeams']:
+            world_cups[col] = pd.to_numeric(world_cups[col], downcast='integer')
+        goal_cols = ['Home Team Goals', 'Away Team Goals']
+        matches[goal_cols] = matches[goal_cols].apply(pd.to_numeric, downcast='integer')
+
         return world_cups, matches, players
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None, None, None
 
+def top_k(values, k=10):
+    """Indices of the k largest values, descending, taking the earliest rows on ties"""
+    k = min(k, len(values))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    # O(n) selection of the kth largest value, then fill the cut-off tie in row order
+    kth = np.partition(values, len(values) - k)[len(values) - k]
+    above = np.flatnonzero(values > kth)
+    ties = np.flatnonzero(values == kth)[:k - len(above)]
+    idx = np.concatenate([above, ties])
+    return idx[np.argsort(-values[idx], kind='stable')]
+
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
+def precompute(world_cups, matches, players):
+    """Derive every aggregate the dashboard pages render (shared read-only across reruns)"""
+    goal_cols = ['Home Team Goals', 'Away Team Goals']
+    matches_clean = matches.dropna(subset=goal_cols).copy()
+    # Goal columns only fall back to float because of the blank rows dropped above
+    matches_clean[goal_cols] = matches_clean[goal_cols].astype('int16')
+    matches_clean['Total Goals'] = np.add(matches_clean['Home Team Goals'].to_numpy(),
+                                          matches_clean['Away Team Goals'].to_numpy(), dtype=np.int16)
+
+    players_clean = players.dropna(subset=['Player Name'])
+
+    # Player aggregates, all over categorical codes so each count is a bincount
+    position_counts = players_clean['Position'].value_counts().head(10)
+    coach_counts = players_clean['Coach Name'].value_counts().head(10)
+
+    # Distinct players per team from unique (team, player) code pairs
+    team_categories = players_clean['Team Initials'].cat.categories
+    team_codes = players_clean['Team Initials'].cat.codes.to_numpy()
+    name_codes = players_clean['Player Name'].astype('category').cat.codes.to_numpy()
+    known = team_codes >= 0
+    pairs = np.unique(np.stack([team_codes[known], name_codes[known]]), axis=1)
+    team_players = pd.Series(np.bincount(pairs[0], minlength=len(team_categories)),
+                             index=team_categories).nlargest(20)
+
+    winner_counts = world_cups['Winner'].value_counts().reset_index()
+    winner_counts.columns = ['Country', 'Wins']
+
+    # Host-nation wins by comparing codes over a shared set of country categories
+    countries = pd.api.types.union_categoricals([world_cups['Country'], world_cups['Winner']]).dtype
+    country_codes = world_cups['Country'].astype(countries).cat.codes.to_numpy()
+    winner_codes = world_cups['Winner'].astype(countries).cat.codes.to_numpy()
+    # Missing values share code -1 and must not count as a match
+    host_mask = (country_codes == winner_codes) & (country_codes >= 0)
+    host_winners = world_cups.loc[host_mask, 'Country'].tolist()
+
+    # Top-10 matches, keeping the same tied rows as nlargest(keep='first')
+    total_goals = matches_clean['Total Goals'].to_numpy()
+    highest_scoring = matches_clean.iloc[top_k(total_goals)][['Year', 'Home Team Name', 'Home Team Goals',
+                                                   'Away Team Name', 'Away Team Goals', 'Total Goals']]
+
+    # Top-10 stages by match count, selected without sorting every stage
+    stages = matches_clean['Stage'].cat.categories
+    stage_codes = matches_clean['Stage'].cat.codes.to_numpy()
+    stage_cnt = np.bincount(stage_codes[stage_codes >= 0], minlength=len(stages))
+    top_stages = top_k(stage_cnt)
+    stage_counts = pd.Series(stage_cnt[top_stages], index=stages[top_stages])
+
+    # Match totals are small non-negative integers, so one bin per goal count
+    goal_hist = np.bincount(total_goals)
+
+    return {
+        'world_cups': world_cups,
+        'totals': (int(world_cups['GoalsScored'].sum()),
+                   int(world_cups['MatchesPlayed'].sum()),
+                   int(world_cups['QualifiedTeams'].sum())),
+        'winner_counts': winner_counts,
+        'host_winners': host_winners,
+        'highest_scoring': highest_scoring,
+        'goal_hist': goal_hist,
+        'home_away_totals': matches_clean[goal_cols].to_numpy(dtype=np.int32).sum(axis=0),
+        'stage_counts': stage_counts,
+        'position_counts': position_counts,
+        'team_players': team_players,
+        'coach_counts': coach_counts,
+    }
+
+def downsample(df, x, y, n_out=1000):
+    """Thin a line trace to n_out rows with MinMaxLTTB, keeping its visual shape"""
+    if MinMaxLTTBDownsampler is None or len(df) <= n_out:
+        return df
+    idx = MinMaxLTTBDownsampler().downsample(df[x].to_numpy(), df[y].to_numpy(), n_out=n_out)
+    return df.iloc[idx]
+
 def main():
     st.markdown('<h1 class="main-header">⚽ FIFA World Cup Dashboard</h1>', unsafe_allow_html=True)
 
@@ -56,6 +172,8 @@ def main():
         st.error("Failed to load data. Please check if CSV files are present.")
         return
 
+    cached = precompute(world_cups, matches, players)
+
     # Sidebar for navigation
     st.sidebar.title("Navigation")
     page = st.sidebar.radio("Choose a section:",
@@ -63,191 +181,193 @@ def main():
                             "Match Statistics", "Player Analysis"])
 
     if page == "Overview":
-        show_overview(world_cups, matches, players)
+        show_overview(cached)
     elif page == "World Cup Winners":
-        show_winners(world_cups)
+        show_winners(cached)
     elif page == "Goals & Attendance":
-        show_goals_attendance(world_cups, matches)
+        show_goals_attendance(cached)
     elif page == "Match Statistics":
-        show_match_stats(matches)
+        show_match_stats(cached)
     elif page == "Player Analysis":
-        show_player_analysis(players, matches)
+        show_player_analysis(cached)
 
-def show_overview(world_cups, matches, players):
+def show_overview(cached):
     st.header("🏆 World Cup Overview")
 
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">{}</div>
-            <div class="metric-label">Tournaments</div>
-        </div>
-        """.format(len(world_cups)), unsafe_allow_html=True)
+    world_cups = cached['world_cups']
+    total_goals, total_matches, total_teams = cached['totals']
 
-    with col2:
-        total_goals = world_cups['GoalsScored'].sum()
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">{}</div>
-            <div class="metric-label">Total Goals</div>
-        </div>
-        """.format(total_goals), unsafe_allow_html=True)
-
-    with col3:
-        total_matches = world_cups['MatchesPlayed'].sum()
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">{}</div>
-            <div class="metric-label">Total Matches</div>
-        </div>
-        """.format(total_matches), unsafe_allow_html=True)
-
-    with col4:
-        total_teams = world_cups['QualifiedTeams'].sum()
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">{}</div>
-            <div class="metric-label">Teams Participated</div>
-        </div>
-        """.format(total_teams), unsafe_allow_html=True)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Tournaments", len(world_cups))
+    col2.metric("Total Goals", f"{total_goals:,}")
+    col3.metric("Total Matches", f"{total_matches:,}")
+    col4.metric("Teams Participated", f"{total_teams:,}")
 
     # Recent tournaments table
     st.subheader("Recent World Cup Tournaments")
     recent_cups = world_cups.tail(5)[['Year', 'Country', 'Winner', 'Runners-Up', 'GoalsScored', 'Attendance']]
-    recent_cups['Attendance'] = recent_cups['Attendance'].str.replace('.', '').astype(float)
-    st.dataframe(recent_cups.style.format({'Attendance': '{:,.0f}'}))
-
-def show_winners(world_cups):
-    st.header("🥇 World Cup Winners")
+    recent_cups = recent_cups.assign(Attendance=recent_cups['Attendance'].map('{:,.0f}'.format))
+    st.dataframe(recent_cups)
 
-    # Count wins by country
-    winner_counts = world_cups['Winner'].value_counts().reset_index()
-    winner_counts.columns = ['Country', 'Wins']
+@st.cache_data(hash_funcs={dict: id})
+def winners_figures(cached):
+    """Build the World Cup Winners charts"""
+    world_cups = cached['world_cups']
+    winner_counts = cached['winner_counts']
 
     # Bar chart of winners
-    fig = px.bar(winner_counts.head(10), x='Country', y='Wins',
-                 title='Most Successful Countries in World Cup History',
-                 color='Wins', color_continuous_scale='Blues')
-    fig.update_layout(xaxis_tickangle=-45)
-    st.plotly_chart(fig, use_container_width=True)
+    top_winners = winner_counts.head(10)
+    fig = go.Figure(go.Bar(x=top_winners['Country'], y=top_winners['Wins'],
+                           marker=dict(color=top_winners['Wins'], colorscale='Blues', showscale=True,
+                                       colorbar=dict(title='Wins')),
+                           hovertemplate='Country=%{x}<br>Wins=%{y}<extra></extra>'))
+    fig.update_layout(title='Most Successful Countries in World Cup History',
+                      xaxis_title='Country', yaxis_title='Wins', xaxis_tickangle=-45)
 
     # Winners over time
-    st.subheader("Winners Timeline")
     fig2 = px.scatter(world_cups, x='Year', y='Winner',
                      title='World Cup Winners Over Time',
-                     size=[50]*len(world_cups), color='Winner')
+                     color='Winner', render_mode='webgl')
     fig2.update_traces(marker=dict(size=20))
+
+    return fig, fig2
+
+def show_winners(cached):
+    st.header("🥇 World Cup Winners")
+
+    fig, fig2 = winners_figures(cached)
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Winners Timeline")
     st.plotly_chart(fig2, use_container_width=True)
 
     # Host countries vs winners
     st.subheader("Host Countries Performance")
-    host_winners = world_cups[world_cups['Country'] == world_cups['Winner']]
-    st.write(f"Host countries have won {len(host_winners)} times: {', '.join(host_winners['Country'].tolist())}")
+    host_winners = cached['host_winners']
+    st.write(f"Host countries have won {len(host_winners)} times: {', '.join(host_winners)}")
+
+@st.cache_data(hash_funcs={dict: id})
+def goals_attendance_figures(cached):
+    """Build the Goals & Attendance charts"""
+    world_cups = cached['world_cups']
+
+    # Goals over time
+    fig1 = px.line(downsample(world_cups, 'Year', 'GoalsScored'), x='Year', y='GoalsScored',
+                  title='Goals Scored Per Tournament',
+                  markers=True, line_shape='spline')
+    fig1.update_traces(line_color='#1f77b4', marker_color='#ff7f0e')
+
+    # Attendance over time
+    fig2 = px.line(downsample(world_cups, 'Year', 'Attendance'), x='Year', y='Attendance',
+                  title='Tournament Attendance Over Time',
+                  markers=True, line_shape='spline')
+    fig2.update_traces(line_color='#2ca02c', marker_color='#d62728')
+    fig2.update_layout(yaxis_tickformat=',')
 
-def show_goals_attendance(world_cups, matches):
+    # Goals vs Attendance correlation
+    fig3 = px.scatter(world_cups, x='GoalsScored', y='Attendance',
+                     title='Relationship Between Goals and Attendance',
+                     color='Year', size='MatchesPlayed',
+                     hover_data=['Country', 'Winner'], render_mode='webgl')
+
+    return fig1, fig2, fig3
+
+def show_goals_attendance(cached):
     st.header("📊 Goals & Attendance Trends")
 
-    # Clean attendance data
-    world_cups_clean = world_cups.copy()
-    world_cups_clean['Attendance'] = world_cups_clean['Attendance'].str.replace('.', '').astype(float)
+    fig1, fig2, fig3 = goals_attendance_figures(cached)
 
     col1, col2 = st.columns(2)
 
     with col1:
-        # Goals over time
-        fig1 = px.line(world_cups, x='Year', y='GoalsScored',
-                      title='Goals Scored Per Tournament',
-                      markers=True, line_shape='spline')
-        fig1.update_traces(line_color='#1f77b4', marker_color='#ff7f0e')
         st.plotly_chart(fig1, use_container_width=True)
 
     with col2:
-        # Attendance over time
-        fig2 = px.line(world_cups_clean, x='Year', y='Attendance',
-                      title='Tournament Attendance Over Time',
-                      markers=True, line_shape='spline')
-        fig2.update_traces(line_color='#2ca02c', marker_color='#d62728')
-        fig2.update_layout(yaxis_tickformat=',')
         st.plotly_chart(fig2, use_container_width=True)
 
-    # Goals vs Attendance correlation
     st.subheader("Goals vs Attendance Correlation")
-    fig3 = px.scatter(world_cups_clean, x='GoalsScored', y='Attendance',
-                     title='Relationship Between Goals and Attendance',
-                     color='Year', size='MatchesPlayed',
-                     hover_data=['Country', 'Winner'])
     st.plotly_chart(fig3, use_container_width=True)
 
-def show_match_stats(matches):
-    st.header("⚽ Match Statistics")
+@st.cache_data(hash_funcs={dict: id})
+def match_stats_figures(cached):
+    """Build the Match Statistics charts"""
+    # Goals distribution
+    goal_hist = cached['goal_hist']
+    fig1 = go.Figure(go.Bar(x=np.arange(len(goal_hist)), y=goal_hist,
+                            marker_color='#1f77b4'))
+    fig1.update_layout(title='Distribution of Total Goals Per Match',
+                       xaxis_title='Total Goals', yaxis_title='count', bargap=0)
+
+    # Home vs Away goals
+    home_goals, away_goals = cached['home_away_totals']
+    fig2 = go.Figure(data=[go.Pie(labels=['Home Team Goals', 'Away Team Goals'],
+                                 values=[home_goals, away_goals],
+                                 title='Home vs Away Goals Distribution')])
+    fig2.update_traces(marker_colors=['#ff7f0e', '#2ca02c'])
 
-    # Clean matches data
-    matches_clean = matches.dropna(subset=['Home Team Goals', 'Away Team Goals'])
+    # Matches by stage
+    stage_counts = cached['stage_counts']
+    fig3 = go.Figure(go.Bar(x=stage_counts.index, y=stage_counts.values,
+                            marker=dict(color=stage_counts.values, colorscale='Reds', showscale=True,
+                                        colorbar=dict(title='Matches')),
+                            hovertemplate='Stage=%{x}<br>Matches=%{y}<extra></extra>'))
+    fig3.update_layout(title='Number of Matches by Stage',
+                       xaxis_title='Stage', yaxis_title='Matches', xaxis_tickangle=-45)
+
+    return fig1, fig2, fig3
 
-    # Most goals in a match
-    matches_clean['Total Goals'] = matches_clean['Home Team Goals'] + matches_clean['Away Team Goals']
-    highest_scoring = matches_clean.nlargest(10, 'Total Goals')[['Year', 'Home Team Name', 'Home Team Goals',
-                                                               'Away Team Name', 'Away Team Goals', 'Total Goals']]
+def show_match_stats(cached):
+    st.header("⚽ Match Statistics")
 
     st.subheader("Highest Scoring Matches")
-    st.dataframe(highest_scoring.style.format({'Total Goals': '{:.0f}'}))
+    st.dataframe(cached['highest_scoring'])
+
+    fig1, fig2, fig3 = match_stats_figures(cached)
 
-    # Goals distribution
     col1, col2 = st.columns(2)
 
     with col1:
-        fig1 = px.histogram(matches_clean, x='Total Goals',
-                           title='Distribution of Total Goals Per Match',
-                           nbins=20, color_discrete_sequence=['#1f77b4'])
         st.plotly_chart(fig1, use_container_width=True)
 
     with col2:
-        # Home vs Away goals
-        home_goals = matches_clean['Home Team Goals'].sum()
-        away_goals = matches_clean['Away Team Goals'].sum()
-
-        fig2 = go.Figure(data=[go.Pie(labels=['Home Team Goals', 'Away Team Goals'],
-                                     values=[home_goals, away_goals],
-                                     title='Home vs Away Goals Distribution')])
-        fig2.update_traces(marker_colors=['#ff7f0e', '#2ca02c'])
         st.plotly_chart(fig2, use_container_width=True)
 
-    # Matches by stage
     st.subheader("Matches by Tournament Stage")
-    stage_counts = matches_clean['Stage'].value_counts().head(10)
-    fig3 = px.bar(stage_counts, x=stage_counts.index, y=stage_counts.values,
-                 title='Number of Matches by Stage', color=stage_counts.values,
-                 color_continuous_scale='Reds')
-    fig3.update_layout(xaxis_tickangle=-45)
     st.plotly_chart(fig3, use_container_width=True)
 
-def show_player_analysis(players, matches):
-    st.header("👥 Player Analysis")
-
-    # Clean players data
-    players_clean = players.dropna(subset=['Player Name'])
-
+@st.cache_data(hash_funcs={dict: id})
+def player_figures(cached):
+    """Build the Player Analysis charts"""
     # Most common positions
-    position_counts = players_clean['Position'].value_counts().head(10)
-    fig1 = px.bar(position_counts, x=position_counts.index, y=position_counts.values,
-                 title='Most Common Player Positions',
-                 color=position_counts.values, color_continuous_scale='Greens')
-    st.plotly_chart(fig1, use_container_width=True)
+    position_counts = cached['position_counts']
+    fig1 = go.Figure(go.Bar(x=position_counts.index, y=position_counts.values,
+                            marker=dict(color=position_counts.values, colorscale='Greens', showscale=True,
+                                        colorbar=dict(title='Players')),
+                            hovertemplate='Position=%{x}<br>Players=%{y}<extra></extra>'))
+    fig1.update_layout(title='Most Common Player Positions',
+                       xaxis_title='Position', yaxis_title='Players')
 
     # Players per team
-    team_players = players_clean.groupby('Team Initials')['Player Name'].nunique().sort_values(ascending=False).head(20)
-    fig2 = px.bar(team_players, x=team_players.index, y=team_players.values,
-                 title='Number of Players by Team (Top 20)',
-                 color=team_players.values, color_continuous_scale='Purples')
-    fig2.update_layout(xaxis_tickangle=-45)
-    st.plotly_chart(fig2, use_container_width=True)
+    team_players = cached['team_players']
+    fig2 = go.Figure(go.Bar(x=team_players.index, y=team_players.values,
+                            marker=dict(color=team_players.values, colorscale='Purples', showscale=True,
+                                        colorbar=dict(title='Players')),
+                            hovertemplate='Team=%{x}<br>Players=%{y}<extra></extra>'))
+    fig2.update_layout(title='Number of Players by Team (Top 20)',
+                       xaxis_title='Team', yaxis_title='Players', xaxis_tickangle=-45)
+
+    return fig1, fig2
+
+def show_player_analysis(cached):
+    st.header("👥 Player Analysis")
+
+    for fig in player_figures(cached):
+        st.plotly_chart(fig, use_container_width=True)
 
     # Coaches analysis
     st.subheader("Famous Coaches")
-    coach_counts = players_clean['Coach Name'].value_counts().head(10)
-    st.dataframe(coach_counts)
+    st.dataframe(cached['coach_counts'])
 
 if __name__ == "__main__":
     main()